@@ -11,7 +11,9 @@ from traitlets.tests.test_traitlets import TraitTestBase
 
 from ipywidgets import Color, NumberFormat
 from ipywidgets.widgets.widget import _remove_buffers, _put_buffers
-from ipywidgets.widgets.trait_types import date_serialization
+from ipywidgets.widgets.trait_types import (
+    _color_names, date_serialization, datetime_serialization
+)
 
 
 class NumberFormatTrait(HasTraits):
@@ -35,8 +37,41 @@ class ColorTrait(HasTraits):
 class TestColor(TraitTestBase):
     obj = ColorTrait()
 
-    _good_values = ["blue", "#AA0", "#FFFFFF"]
-    _bad_values = ["vanilla", "blues"]
+    _good_values = ["blue", "#AA0", "#FFFFFF", "indianred", "Indigo"]
+    _bad_values = ["vanilla", "blues", "#FFF\n"]
+
+    def test_color_names_are_normalized(self):
+        for name in _color_names:
+            self.assertEqual(name, name.strip().lower())
+
+
+class TestDatetimeSerialization(TestCase):
+
+    def setUp(self):
+        self.to_json = datetime_serialization['to_json']
+        self.from_json = datetime_serialization['from_json']
+        self.dummy_manager = None
+
+    def test_serialize_datetime(self):
+        datetime = dt.datetime(1900, 2, 18, 3, 4, 5, 6789)
+        expected = {
+            'year': 1900,
+            'month': 1,
+            'date': 18,
+            'hours': 3,
+            'minutes': 4,
+            'seconds': 5,
+            'milliseconds': 6
+        }
+        self.assertEqual(self.to_json(datetime, self.dummy_manager), expected)
+
+    def test_round_trip_datetime(self):
+        datetime = dt.datetime(1900, 2, 18, 3, 4, 5, 6000)
+        serialized = self.to_json(datetime, self.dummy_manager)
+        self.assertEqual(
+            self.from_json(serialized, self.dummy_manager),
+            datetime
+        )
 
 
 class TestDateSerialization(TestCase):
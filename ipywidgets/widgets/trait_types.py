@@ -9,9 +9,32 @@ import re
 import traitlets
 import datetime as dt
 
+try:
+    from functools import lru_cache
+except ImportError:
+    # Python 2: validate without caching
+    def lru_cache(maxsize=128):
+        return lambda func: func
 
-_color_names = ['aliceblue', 'antiquewhite', 'aqua', 'aquamarine', 'azure', 'beige', 'bisque', 'black', 'blanchedalmond', 'blue', 'blueviolet', 'brown', 'burlywood', 'cadetblue', 'chartreuse', 'chocolate', 'coral', 'cornflowerblue', 'cornsilk', 'crimson', 'cyan', 'darkblue', 'darkcyan', 'darkgoldenrod', 'darkgray', 'darkgreen', 'darkkhaki', 'darkmagenta', 'darkolivegreen', 'darkorange', 'darkorchid', 'darkred', 'darksalmon', 'darkseagreen', 'darkslateblue', 'darkslategray', 'darkturquoise', 'darkviolet', 'deeppink', 'deepskyblue', 'dimgray', 'dodgerblue', 'firebrick', 'floralwhite', 'forestgreen', 'fuchsia', 'gainsboro', 'ghostwhite', 'gold', 'goldenrod', 'gray', 'green', 'greenyellow', 'honeydew', 'hotpink', 'indianred ', 'indigo ', 'ivory', 'khaki', 'lavender', 'lavenderblush', 'lawngreen', 'lemonchiffon', 'lightblue', 'lightcoral', 'lightcyan', 'lightgoldenrodyellow', 'lightgray', 'lightgreen', 'lightpink', 'lightsalmon', 'lightseagreen', 'lightskyblue', 'lightslategray', 'lightsteelblue', 'lightyellow', 'lime', 'limegreen', 'linen', 'magenta', 'maroon', 'mediumaquamarine', 'mediumblue', 'mediumorchid', 'mediumpurple', 'mediumseagreen', 'mediumslateblue', 'mediumspringgreen', 'mediumturquoise', 'mediumvioletred', 'midnightblue', 'mintcream', 'mistyrose', 'moccasin', 'navajowhite', 'navy', 'oldlace', 'olive', 'olivedrab', 'orange', 'orangered', 'orchid', 'palegoldenrod', 'palegreen', 'paleturquoise', 'palevioletred', 'papayawhip', 'peachpuff', 'peru', 'pink', 'plum', 'powderblue', 'purple', 'rebeccapurple', 'red', 'rosybrown', 'royalblue', 'saddlebrown', 'salmon', 'sandybrown', 'seagreen', 'seashell', 'sienna', 'silver', 'skyblue', 'slateblue', 'slategray', 'snow', 'springgreen', 'steelblue', 'tan', 'teal', 'thistle', 'tomato', 'turquoise', 'violet', 'wheat', 'white', 'whitesmoke', 'yellow', 'yellowgreen']
-_color_re = re.compile(r'#[a-fA-F0-9]{3}(?:[a-fA-F0-9]{3})?$')
+
+_color_names = frozenset(['aliceblue', 'antiquewhite', 'aqua', 'aquamarine', 'azure', 'beige', 'bisque', 'black', 'blanchedalmond', 'blue', 'blueviolet', 'brown', 'burlywood', 'cadetblue', 'chartreuse', 'chocolate', 'coral', 'cornflowerblue', 'cornsilk', 'crimson', 'cyan', 'darkblue', 'darkcyan', 'darkgoldenrod', 'darkgray', 'darkgreen', 'darkkhaki', 'darkmagenta', 'darkolivegreen', 'darkorange', 'darkorchid', 'darkred', 'darksalmon', 'darkseagreen', 'darkslateblue', 'darkslategray', 'darkturquoise', 'darkviolet', 'deeppink', 'deepskyblue', 'dimgray', 'dodgerblue', 'firebrick', 'floralwhite', 'forestgreen', 'fuchsia', 'gainsboro', 'ghostwhite', 'gold', 'goldenrod', 'gray', 'green', 'greenyellow', 'honeydew', 'hotpink', 'indianred', 'indigo', 'ivory', 'khaki', 'lavender', 'lavenderblush', 'lawngreen', 'lemonchiffon', 'lightblue', 'lightcoral', 'lightcyan', 'lightgoldenrodyellow', 'lightgray', 'lightgreen', 'lightpink', 'lightsalmon', 'lightseagreen', 'lightskyblue', 'lightslategray', 'lightsteelblue', 'lightyellow', 'lime', 'limegreen', 'linen', 'magenta', 'maroon', 'mediumaquamarine', 'mediumblue', 'mediumorchid', 'mediumpurple', 'mediumseagreen', 'mediumslateblue', 'mediumspringgreen', 'mediumturquoise', 'mediumvioletred', 'midnightblue', 'mintcream', 'mistyrose', 'moccasin', 'navajowhite', 'navy', 'oldlace', 'olive', 'olivedrab', 'orange', 'orangered', 'orchid', 'palegoldenrod', 'palegreen', 'paleturquoise', 'palevioletred', 'papayawhip', 'peachpuff', 'peru', 'pink', 'plum', 'powderblue', 'purple', 'rebeccapurple', 'red', 'rosybrown', 'royalblue', 'saddlebrown', 'salmon', 'sandybrown', 'seagreen', 'seashell', 'sienna', 'silver', 'skyblue', 'slateblue', 'slategray', 'snow', 'springgreen', 'steelblue', 'tan', 'teal', 'thistle', 'tomato', 'turquoise', 'violet', 'wheat', 'white', 'whitesmoke', 'yellow', 'yellowgreen'])
+_hex_digits = frozenset('0123456789abcdefABCDEF')
+
+
+def _is_hex_color(value):
+    """Whether value is a '#RGB' or '#RRGGBB' hex color literal."""
+    return (len(value) in (4, 7) and value[0] == '#' and
+            _hex_digits.issuperset(value[1:]))
+
+
+@lru_cache(maxsize=256)
+def _is_valid_color(value):
+    """Whether value is a valid HTML color name or hex color literal.
+
+    Results are cached, since widgets tend to reuse a small palette.
+    """
+    # Check hex literals first, which avoids lowercasing the value
+    return _is_hex_color(value) or value.lower() in _color_names
 
 
 class Color(traitlets.Unicode):
@@ -21,7 +44,7 @@ class Color(traitlets.Unicode):
     default_value = traitlets.Undefined
 
     def validate(self, obj, value):
-        if value.lower() in _color_names or _color_re.match(value):
+        if _is_valid_color(value):
             return value
         self.error(obj, value)
 
@@ -58,15 +81,15 @@ def datetime_to_json(pydt, manager):
     if pydt is None:
         return None
     else:
-        return dict(
-            year=pydt.year,
-            month=pydt.month - 1,  # Months are 0-based indices in JS
-            date=pydt.day,
-            hours=pydt.hour,       # Hours, Minutes, Seconds and Milliseconds
-            minutes=pydt.minute,   # are plural in JS
-            seconds=pydt.second,
-            milliseconds=pydt.microsecond / 1000
-        )
+        return {
+            'year': pydt.year,
+            'month': pydt.month - 1,  # Months are 0-based indices in JS
+            'date': pydt.day,
+            'hours': pydt.hour,       # Hours, Minutes, Seconds and Milliseconds
+            'minutes': pydt.minute,   # are plural in JS
+            'seconds': pydt.second,
+            'milliseconds': pydt.microsecond // 1000
+        }
 
 
 def datetime_from_json(js, manager):
@@ -143,9 +166,10 @@ class InstanceDict(traitlets.Instance):
                           **(self.default_kwargs or {}))
 
 
-# The regexp is taken
+# The regexp is adapted
 # from https://github.com/d3/d3-format/blob/master/src/formatSpecifier.js
-_number_format_re = re.compile('^(?:(.)?([<>=^]))?([+\-\( ])?([$#])?(0)?(\d+)?(,)?(\.\d+)?([a-z%])?$', re.I)
+# Only the type specifier is captured, since it is the only group we read.
+_number_format_re = re.compile(r'^(?:.?[<>=^])?[+\-( ]?[$#]?0?\d*,?(?:\.\d+)?([a-z%])?$', re.I)
 
 # The valid types are taken from
 # https://github.com/d3/d3-format/blob/master/src/formatTypes.js
@@ -155,6 +179,20 @@ _number_format_types = {
 }
 
 
+@lru_cache(maxsize=128)
+def _parse_number_format(value):
+    """Parse a d3 number format specifier.
+
+    Returns a ``(valid, format_type)`` tuple, where ``valid`` is whether
+    the specifier is well-formed and ``format_type`` is its type, or
+    None if no type is given.
+    """
+    re_match = _number_format_re.match(value)
+    if re_match is None:
+        return False, None
+    return True, re_match.group(1)
+
+
 class NumberFormat(traitlets.Unicode):
     """A string holding a number format specifier, e.g. '.3f'
 
@@ -167,19 +205,17 @@ class NumberFormat(traitlets.Unicode):
 
     def validate(self, obj, value):
         value = super(NumberFormat, self).validate(obj, value)
-        re_match = _number_format_re.match(value)
-        if re_match is None:
+        valid, format_type = _parse_number_format(value)
+        if not valid:
             self.error(obj, value)
+        elif format_type is None:
+            return value
+        elif format_type in _number_format_types:
+            return value
         else:
-            format_type = re_match.group(9)
-            if format_type is None:
-                return value
-            elif format_type in _number_format_types:
-                return value
-            else:
-                raise traitlets.TraitError(
-                    'The type specifier of a NumberFormat trait must '
-                    'be one of {}, but a value of \'{}\' was '
-                    'specified.'.format(
-                        list(_number_format_types), format_type)
-                )
+            raise traitlets.TraitError(
+                'The type specifier of a NumberFormat trait must '
+                'be one of {}, but a value of \'{}\' was '
+                'specified.'.format(
+                    list(_number_format_types), format_type)
+            )